@@ -409,10 +409,31 @@ class Service:
         self._info.endpoints.append(ep.info)
         return ep
 
+    async def _flush_pending(self) -> None:
+        """Wait until messages delivered to endpoints have been processed.
+
+        This is mostly useful during tests, in order to observe the
+        side effects of messages published without a reply subject.
+        """
+        # nats-py writes the PING sent by flush() directly to the transport,
+        # while published messages wait in the pending buffer for the flusher
+        # task, so the first PING may be written before them. The flusher runs
+        # during the first round trip, so the second PING follows them.
+        await self._nc.flush()
+        await self._nc.flush()
+        await asyncio.gather(*(_wait_endpoint_pending(ep) for ep in self._endpoints))
+
+    # Replies are not written to the socket directly: nats-py buffers
+    # published messages and its flusher task writes all pending messages
+    # at once, so replies sent during the same loop iteration are coalesced.
+
     async def _handle_ping_request(self, msg: Msg) -> None:
         """Handle the ping message."""
         await msg.respond(data=self._ping_response_message)
 
+    # Info and stats replies are encoded on every request: endpoints expose
+    # their info and stats objects, which may be modified in place at any time.
+
     async def _handle_info_request(self, msg: Msg) -> None:
         """Handle the info message."""
         await msg.respond(data=internal.encode_info(self._info))
@@ -442,21 +463,21 @@ def _create_handler(
 
     async def handler(msg: Msg) -> None:
         timer = internal.Timer()
-        endpoint.stats.num_requests += 1
+        # Stats are replaced on reset, so they are looked up once per message
+        stats = endpoint.stats
+        stats.num_requests += 1
         request = NatsRequest(msg)
         try:
             await micro_handler(request)
         except Exception as exc:
-            endpoint.stats.num_errors += 1
-            endpoint.stats.last_error = repr(exc)
+            stats.num_errors += 1
+            stats.last_error = repr(exc)
             await request.respond_error(
                 code=500,
                 description="Internal Server Error",
             )
-        endpoint.stats.processing_time += timer.elapsed_nanoseconds()
-        endpoint.stats.average_processing_time = int(
-            endpoint.stats.processing_time / endpoint.stats.num_requests
-        )
+        stats.processing_time += timer.elapsed_nanoseconds()
+        stats.average_processing_time = stats.processing_time // stats.num_requests
 
     return handler
 
@@ -468,6 +489,12 @@ async def _stop_endpoint(endpoint: Endpoint) -> None:
         endpoint._sub = None  # pyright: ignore[reportPrivateUsage]
 
 
+async def _wait_endpoint_pending(endpoint: Endpoint) -> None:
+    """Wait until all pending messages of the endpoint have been processed."""
+    if endpoint._sub:  # pyright: ignore[reportPrivateUsage]
+        await endpoint._sub._pending_queue.join()  # pyright: ignore[reportPrivateUsage]
+
+
 async def _unsubscribe(sub: Subscription) -> None:
     try:
         await sub.unsubscribe()
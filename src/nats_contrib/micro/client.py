@@ -288,16 +288,25 @@ class Instance:
         self.client = client
         self.service = service
         self.id = id
+        # Instance subjects never change, compute them once
+        self._ping_subject = internal.get_internal_subject(
+            internal.ServiceVerb.PING, service, id, client.api_prefix
+        )
+        self._info_subject = internal.get_internal_subject(
+            internal.ServiceVerb.INFO, service, id, client.api_prefix
+        )
+        self._stats_subject = internal.get_internal_subject(
+            internal.ServiceVerb.STATS, service, id, client.api_prefix
+        )
 
     async def ping(
         self,
         timeout: float = 0.5,
     ) -> PingInfo:
         """Ping a service instance."""
-        subject = internal.get_internal_subject(
-            internal.ServiceVerb.PING, self.service, self.id, self.client.api_prefix
+        response = await self.client.nc.request(
+            self._ping_subject, b"", timeout=timeout
         )
-        response = await self.client.nc.request(subject, b"", timeout=timeout)
         return PingInfo.from_response(json.loads(response.data))
 
     async def info(
@@ -305,10 +314,9 @@ class Instance:
         timeout: float = 0.5,
     ) -> ServiceInfo:
         """Get the service instance information."""
-        subject = internal.get_internal_subject(
-            internal.ServiceVerb.INFO, self.service, self.id, self.client.api_prefix
+        response = await self.client.nc.request(
+            self._info_subject, b"", timeout=timeout
         )
-        response = await self.client.nc.request(subject, b"", timeout=timeout)
         return ServiceInfo.from_response(json.loads(response.data))
 
     async def stats(
@@ -316,11 +324,7 @@ class Instance:
         timeout: float = 0.5,
     ) -> ServiceStats:
         """Get the service instance stats."""
-        subject = internal.get_internal_subject(
-            internal.ServiceVerb.STATS,
-            self.service,
-            self.id,
-            self.client.api_prefix,
+        response = await self.client.nc.request(
+            self._stats_subject, b"", timeout=timeout
         )
-        response = await self.client.nc.request(subject, b"", timeout=timeout)
         return ServiceStats.from_response(json.loads(response.data))
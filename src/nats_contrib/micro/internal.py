@@ -16,10 +16,16 @@ from dataclasses import dataclass
 from datetime import datetime, timezone
 from enum import Enum
 from json import dumps
+from typing import Any
 
 from .models import EndpointInfo, EndpointStats, PingInfo, ServiceInfo, ServiceStats
 from .request import Handler
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 
 class ServiceVerb(str, Enum):
     PING = "PING"
@@ -229,16 +235,31 @@ def new_ping_info(id: str, config: ServiceConfig) -> PingInfo:
     )
 
 
+def encode_json(obj: dict[str, Any]) -> bytes:
+    """Encode an object into compact JSON.
+
+    orjson is used when installed, else the standard library json module.
+    The standard library is also used for objects orjson cannot encode,
+    such as integers exceeding 64 bits.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            pass
+    return dumps(obj, separators=(",", ":")).encode()
+
+
 def encode_ping_info(info: PingInfo) -> bytes:
-    return dumps(info.as_dict(), separators=(",", ":")).encode()
+    return encode_json(info.as_dict())
 
 
 def encode_stats(stats: ServiceStats) -> bytes:
-    return dumps(stats.as_dict(), separators=(",", ":")).encode()
+    return encode_json(stats.as_dict())
 
 
 def encode_info(info: ServiceInfo) -> bytes:
-    return dumps(info.as_dict(), separators=(",", ":")).encode()
+    return encode_json(info.as_dict())
 
 
 def default_clock() -> datetime:
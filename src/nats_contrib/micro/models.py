@@ -1,36 +1,30 @@
 from __future__ import annotations
 
 import datetime
-from dataclasses import dataclass, fields, replace
-from typing import Any, TypeVar
+import sys
+from dataclasses import dataclass
+from typing import Any
 
-T = TypeVar("T", bound="Base")
+PING_RESPONSE_TYPE = sys.intern("io.nats.micro.v1.ping_response")
+"""Type of the response to a PING request."""
 
+INFO_RESPONSE_TYPE = sys.intern("io.nats.micro.v1.info_response")
+"""Type of the response to an INFO request."""
 
-@dataclass
-class Base:
-    @classmethod
-    def from_response(cls: type[T], resp: dict[str, Any]) -> T:
-        """Read the class instance from a server response.
+STATS_RESPONSE_TYPE = sys.intern("io.nats.micro.v1.stats_response")
+"""Type of the response to a STATS request."""
 
-        Unknown fields are ignored ("open-world assumption").
-        """
-        params = {}
-        for field in fields(cls):
-            if field.name in resp:
-                params[field.name] = resp[field.name]
-        return cls(**params)
+if sys.version_info >= (3, 10):
+    # Dataclasses support slots starting from Python 3.10.
+    # Slotted dataclasses are re-created by the decorator, which breaks
+    # zero-argument super() in their methods.
+    _DATACLASS_OPTIONS: dict[str, Any] = {"slots": True}
+else:
+    _DATACLASS_OPTIONS: dict[str, Any] = {}
 
-    def as_dict(self) -> dict[str, Any]:
-        """Return the object converted into an API-friendly dict."""
-        result: dict[str, Any] = {}
-        for field in fields(self):
-            val = getattr(self, field.name)
-            if val is None:
-                continue
-            result[field.name] = val
-        return result
 
+@dataclass(**_DATACLASS_OPTIONS)
+class Base:
     @staticmethod
     def _convert_rfc3339(resp: dict[str, Any], field: str) -> None:
         """Convert a RFC 3339 formatted string into a datetime.
@@ -59,7 +53,7 @@ class Base:
         return date.isoformat().replace("+00:00", "Z").replace(".000000", "")
 
 
-@dataclass
+@dataclass(eq=False, **_DATACLASS_OPTIONS)
 class EndpointStats(Base):
     """
     Statistics about a specific service endpoint
@@ -102,11 +96,74 @@ class EndpointStats(Base):
     Additional statistics the endpoint makes available
     """
 
+    def __eq__(self, other: object) -> bool:
+        # Compare identifying fields first so that different
+        # endpoints are told apart without looking at counters.
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        assert isinstance(other, EndpointStats)
+        return (
+            self.name == other.name
+            and self.subject == other.subject
+            and self.num_requests == other.num_requests
+            and self.num_errors == other.num_errors
+            and self.processing_time == other.processing_time
+            and self.average_processing_time == other.average_processing_time
+            and self.last_error == other.last_error
+            and self.queue_group == other.queue_group
+            and self.data == other.data
+        )
+
     def copy(self) -> EndpointStats:
-        return replace(self, data=None if self.data is None else self.data.copy())
+        return EndpointStats(
+            name=self.name,
+            subject=self.subject,
+            num_requests=self.num_requests,
+            num_errors=self.num_errors,
+            last_error=self.last_error,
+            processing_time=self.processing_time,
+            average_processing_time=self.average_processing_time,
+            queue_group=self.queue_group,
+            data=None if self.data is None else self.data.copy(),
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the object converted into an API-friendly dict."""
+        result: dict[str, Any] = {
+            "name": self.name,
+            "subject": self.subject,
+            "num_requests": self.num_requests,
+            "num_errors": self.num_errors,
+            "last_error": self.last_error,
+            "processing_time": self.processing_time,
+            "average_processing_time": self.average_processing_time,
+        }
+        if self.queue_group is not None:
+            result["queue_group"] = self.queue_group
+        if self.data is not None:
+            result["data"] = self.data
+        return result
 
+    @classmethod
+    def from_response(cls, resp: dict[str, Any]) -> EndpointStats:
+        """Read the class instance from a server response.
 
-@dataclass
+        Unknown fields are ignored ("open-world assumption").
+        """
+        return cls(
+            name=resp["name"],
+            subject=resp["subject"],
+            num_requests=resp["num_requests"],
+            num_errors=resp["num_errors"],
+            last_error=resp["last_error"],
+            processing_time=resp["processing_time"],
+            average_processing_time=resp["average_processing_time"],
+            queue_group=resp.get("queue_group"),
+            data=resp.get("data"),
+        )
+
+
+@dataclass(eq=False, **_DATACLASS_OPTIONS)
 class ServiceStats(Base):
     """The statistics of a service."""
 
@@ -133,20 +190,46 @@ class ServiceStats(Base):
     metadata: dict[str, str] | None = None
     """Service metadata."""
 
-    type: str = "io.nats.micro.v1.stats_response"
+    type: str = STATS_RESPONSE_TYPE
+
+    def __eq__(self, other: object) -> bool:
+        # Compare identifying fields first and endpoints last
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        assert isinstance(other, ServiceStats)
+        return (
+            self.id == other.id
+            and self.name == other.name
+            and self.version == other.version
+            and self.started == other.started
+            and self.type == other.type
+            and self.metadata == other.metadata
+            and self.endpoints == other.endpoints
+        )
 
     def copy(self) -> ServiceStats:
-        return replace(
-            self,
+        return ServiceStats(
+            name=self.name,
+            id=self.id,
+            version=self.version,
+            started=self.started,
             endpoints=[ep.copy() for ep in self.endpoints],
             metadata=None if self.metadata is None else self.metadata.copy(),
+            type=self.type,
         )
 
     def as_dict(self) -> dict[str, Any]:
         """Return the object converted into an API-friendly dict."""
-        result = super().as_dict()
-        result["endpoints"] = [ep.as_dict() for ep in self.endpoints]
-        result["started"] = self._to_rfc3339(self.started)
+        result: dict[str, Any] = {
+            "name": self.name,
+            "id": self.id,
+            "version": self.version,
+            "started": self._to_rfc3339(self.started),
+            "endpoints": [ep.as_dict() for ep in self.endpoints],
+        }
+        if self.metadata is not None:
+            result["metadata"] = self.metadata
+        result["type"] = self.type
         return result
 
     @classmethod
@@ -156,12 +239,18 @@ class ServiceStats(Base):
         Unknown fields are ignored ("open-world assumption").
         """
         cls._convert_rfc3339(resp, "started")
-        stats = super().from_response(resp)
-        stats.endpoints = [EndpointStats.from_response(ep) for ep in resp["endpoints"]]
-        return stats
+        return cls(
+            name=resp["name"],
+            id=resp["id"],
+            version=resp["version"],
+            started=resp["started"],
+            endpoints=[EndpointStats.from_response(ep) for ep in resp["endpoints"]],
+            metadata=resp.get("metadata"),
+            type=resp.get("type", STATS_RESPONSE_TYPE),
+        )
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class EndpointInfo(Base):
     """The information of an endpoint."""
 
@@ -183,13 +272,37 @@ class EndpointInfo(Base):
     """
 
     def copy(self) -> EndpointInfo:
-        return replace(
-            self,
+        return EndpointInfo(
+            name=self.name,
+            subject=self.subject,
             metadata=None if self.metadata is None else self.metadata.copy(),
+            queue_group=self.queue_group,
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the object converted into an API-friendly dict."""
+        result: dict[str, Any] = {"name": self.name, "subject": self.subject}
+        if self.metadata is not None:
+            result["metadata"] = self.metadata
+        if self.queue_group is not None:
+            result["queue_group"] = self.queue_group
+        return result
+
+    @classmethod
+    def from_response(cls, resp: dict[str, Any]) -> EndpointInfo:
+        """Read the class instance from a server response.
+
+        Unknown fields are ignored ("open-world assumption").
+        """
+        return cls(
+            name=resp["name"],
+            subject=resp["subject"],
+            metadata=resp.get("metadata"),
+            queue_group=resp.get("queue_group"),
         )
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ServiceInfo(Base):
     """The information of a service."""
 
@@ -217,20 +330,30 @@ class ServiceInfo(Base):
     """
     Information for all service endpoints
     """
-    type: str = "io.nats.micro.v1.info_response"
+    type: str = INFO_RESPONSE_TYPE
 
     def copy(self) -> ServiceInfo:
-        return replace(
-            self,
-            endpoints=[ep.copy() for ep in self.endpoints],
+        return ServiceInfo(
+            name=self.name,
+            id=self.id,
+            version=self.version,
+            description=self.description,
             metadata=self.metadata.copy(),
+            endpoints=[ep.copy() for ep in self.endpoints],
+            type=self.type,
         )
 
     def as_dict(self) -> dict[str, Any]:
         """Return the object converted into an API-friendly dict."""
-        result = super().as_dict()
-        result["endpoints"] = [ep.as_dict() for ep in self.endpoints]
-        return result
+        return {
+            "name": self.name,
+            "id": self.id,
+            "version": self.version,
+            "description": self.description,
+            "metadata": self.metadata,
+            "endpoints": [ep.as_dict() for ep in self.endpoints],
+            "type": self.type,
+        }
 
     @classmethod
     def from_response(cls, resp: dict[str, Any]) -> ServiceInfo:
@@ -238,12 +361,18 @@ class ServiceInfo(Base):
 
         Unknown fields are ignored ("open-world assumption").
         """
-        info = super().from_response(resp)
-        info.endpoints = [EndpointInfo(**ep) for ep in resp["endpoints"]]
-        return info
+        return cls(
+            name=resp["name"],
+            id=resp["id"],
+            version=resp["version"],
+            description=resp["description"],
+            metadata=resp["metadata"],
+            endpoints=[EndpointInfo.from_response(ep) for ep in resp["endpoints"]],
+            type=resp.get("type", INFO_RESPONSE_TYPE),
+        )
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class PingInfo(Base):
     """The response to a ping message."""
 
@@ -251,7 +380,37 @@ class PingInfo(Base):
     id: str
     version: str
     metadata: dict[str, str]
-    type: str = "io.nats.micro.v1.ping_response"
+    type: str = PING_RESPONSE_TYPE
 
     def copy(self) -> PingInfo:
-        return replace(self, metadata=self.metadata.copy())
+        return PingInfo(
+            name=self.name,
+            id=self.id,
+            version=self.version,
+            metadata=self.metadata.copy(),
+            type=self.type,
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the object converted into an API-friendly dict."""
+        return {
+            "name": self.name,
+            "id": self.id,
+            "version": self.version,
+            "metadata": self.metadata,
+            "type": self.type,
+        }
+
+    @classmethod
+    def from_response(cls, resp: dict[str, Any]) -> PingInfo:
+        """Read the class instance from a server response.
+
+        Unknown fields are ignored ("open-world assumption").
+        """
+        return cls(
+            name=resp["name"],
+            id=resp["id"],
+            version=resp["version"],
+            metadata=resp["metadata"],
+            type=resp.get("type", PING_RESPONSE_TYPE),
+        )
@@ -11,7 +11,7 @@ from nats_contrib.test_server import NATSD
 
 
 @pytest_asyncio.fixture
-async def nats_client() -> AsyncIterator[NATS]:
+async def nats_client(nats_server: NATSD) -> AsyncIterator[NATS]:
     client = NATS()
     await client.connect()
     try:
@@ -20,7 +20,7 @@ async def nats_client() -> AsyncIterator[NATS]:
         await client.close()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def nats_server() -> Iterator[NATSD]:
     with contextlib.ExitStack() as stack:
         tmpdir = stack.enter_context(
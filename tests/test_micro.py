@@ -1,36 +1,137 @@
 from __future__ import annotations
 
+import asyncio
 import contextlib
+import dataclasses
 import datetime
-from typing import AsyncIterator
+import functools
+import json
+from typing import AsyncContextManager, AsyncIterator, TypeVar, Union
+from unittest.mock import AsyncMock
 
 import pytest
 import pytest_asyncio
 from nats.aio.client import Client as NATS
+from nats.aio.msg import Msg
 from nats_contrib.test_server import NATSD
 
 from nats_contrib import micro
 from nats_contrib.micro import client as micro_client
-from nats_contrib.micro import testing
+from nats_contrib.micro import internal, testing
+
+T = TypeVar("T")
 
 UNIX_START_TIME = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+UNIX_SECOND_DAY = datetime.datetime(1970, 1, 2, tzinfo=datetime.timezone.utc)
+
+EXPECTED_PING = micro.models.PingInfo(
+    id="123456789",
+    name="service1",
+    version="0.0.1",
+    metadata={},
+    type="io.nats.micro.v1.ping_response",
+)
+
+EXPECTED_INFO = micro.ServiceInfo(
+    id="123456789",
+    name="service1",
+    version="0.0.1",
+    description="",
+    endpoints=[],
+    metadata={},
+    type="io.nats.micro.v1.info_response",
+)
+
+EXPECTED_STATS = micro.ServiceStats(
+    name="service1",
+    version="0.0.1",
+    id="123456789",
+    endpoints=[],
+    metadata={},
+    type="io.nats.micro.v1.stats_response",
+    started=UNIX_START_TIME,
+)
 
 
-@pytest.mark.asyncio
 class MicroTestSetup:
-    @pytest_asyncio.fixture(autouse=True)
-    async def setup(self, nats_server: NATSD, nats_client: NATS) -> AsyncIterator[None]:
+    @pytest.fixture(autouse=True)
+    def setup(self, nats_server: NATSD, nats_client: NATS) -> None:
         self.nats_server = nats_server
         self.nats_client = nats_client
         self.micro_client = micro_client.Client(nats_client)
-        self.test_stack = contextlib.AsyncExitStack()
         self.exception_to_raise = ValueError("error")
-        async with self.test_stack:
-            yield None
+
+    @pytest_asyncio.fixture
+    async def service(self) -> AsyncIterator[micro.Service]:
+        async with micro.add_service(
+            self.nats_client,
+            self.service_name(),
+            self.service_version(),
+            id_generator=self.service_id,
+            now=self.now,
+        ) as service:
+            yield service
+
+    @functools.cached_property
+    def instance_client(self) -> micro_client.Instance:
+        return self.micro_client.instance(self.service_name(), self.service_id())
 
     def now(self) -> datetime.datetime:
         return UNIX_START_TIME
 
+    def expect_info(
+        self,
+        *,
+        name: str = "endpoint1",
+        subject: str = "endpoint1",
+        queue_group: str = "q",
+    ) -> micro.ServiceInfo:
+        return micro.ServiceInfo(
+            id=self.service_id(),
+            name=self.service_name(),
+            version=self.service_version(),
+            description="",
+            endpoints=[
+                micro.EndpointInfo(
+                    name=name,
+                    subject=subject,
+                    queue_group=queue_group,
+                    metadata={},
+                )
+            ],
+            metadata={},
+            type="io.nats.micro.v1.info_response",
+        )
+
+    def expect_stats(
+        self,
+        *,
+        name: str = "endpoint1",
+        subject: str = "endpoint1",
+        queue_group: str = "q",
+    ) -> micro.ServiceStats:
+        return micro.ServiceStats(
+            name=self.service_name(),
+            version=self.service_version(),
+            id=self.service_id(),
+            endpoints=[
+                micro.EndpointStats(
+                    name=name,
+                    subject=subject,
+                    queue_group=queue_group,
+                    num_errors=0,
+                    num_requests=0,
+                    last_error="",
+                    processing_time=0,
+                    average_processing_time=0,
+                    data={},
+                )
+            ],
+            metadata={},
+            type="io.nats.micro.v1.stats_response",
+            started=UNIX_START_TIME,
+        )
+
     def service_id(self) -> str:
         return "123456789"
 
@@ -63,7 +164,6 @@ class MicroTestSetup:
         return handler
 
 
-@pytest.mark.asyncio
 class TestRequestStub:
     async def test_respond(self) -> None:
 
@@ -114,17 +214,17 @@ class TestRequestStub:
             **(headers if headers else {}),
         }
 
-    async def test_init_validates_subject_parameter(self) -> None:
+    def test_init_validates_subject_parameter(self) -> None:
         with pytest.raises(TypeError) as exc_info:
             testing.make_request(123, b"the-payload", {"the": "header"})  # type: ignore
         assert str(exc_info.value) == "subject must be a string, not int"
 
-    async def test_init_validates_data_parameter(self) -> None:
+    def test_init_validates_data_parameter(self) -> None:
         with pytest.raises(TypeError) as exc_info:
             testing.make_request("the-subject", "the-payload", {"the": "header"})  # type: ignore
         assert str(exc_info.value) == "data must be bytes, not str"
 
-    async def test_init_validates_headers_parameter(self) -> None:
+    def test_init_validates_headers_parameter(self) -> None:
         with pytest.raises(TypeError) as exc_info:
             testing.make_request("the-subject", b"the-payload", "the-header")  # type: ignore
         assert str(exc_info.value) == "headers must be a dict, not str"
@@ -141,21 +241,54 @@ class TestRequestStub:
             await request.respond(b"the-response", "the-response-header")  # type: ignore
         assert str(exc_info.value) == "headers must be a dict, not str"
 
-    async def test_response_data_getter_raises_error_when_not_responded(self) -> None:
+    def test_response_data_getter_raises_error_when_not_responded(self) -> None:
         request = testing.make_request("the-subject", b"the-paylaod", {"the": "header"})
         with pytest.raises(testing.NoResponseError) as exc_info:
             request.response_data()
         assert str(exc_info.value) == "No response has been set"
 
-    async def test_response_headers_getter_raises_error_when_not_responded(
-        self,
-    ) -> None:
+    def test_response_headers_getter_raises_error_when_not_responded(self) -> None:
         request = testing.make_request("the-subject", b"the-paylaod", {"the": "header"})
         with pytest.raises(testing.NoResponseError) as exc_info:
             request.response_headers()
         assert str(exc_info.value) == "No response has been set"
 
 
+class TestMicroClientRequest:
+    def make_client(self, response: Msg) -> micro_client.Client:
+        nc = AsyncMock()
+        nc.request.return_value = response
+        return micro_client.Client(nc)
+
+    async def test_request(self) -> None:
+        response = Msg(
+            _client=AsyncMock(),
+            data=b"the-response",
+            headers={"the": "response-header"},
+        )
+        client = self.make_client(response)
+        reply = await client.request("the-subject", b"the-payload")
+        assert reply is response
+
+    async def test_request_with_error(self) -> None:
+        client = self.make_client(
+            Msg(
+                _client=AsyncMock(),
+                data=b"the-error",
+                headers={
+                    "Nats-Service-Error-Code": "500",
+                    "Nats-Service-Error": "Internal Server Error",
+                },
+            )
+        )
+        with pytest.raises(micro_client.ServiceError) as exc_info:
+            await client.request("the-subject", b"the-payload")
+        assert exc_info.value.code == 500
+        assert exc_info.value.description == "Internal Server Error"
+        assert exc_info.value.subject == "the-subject"
+        assert exc_info.value.data == b"the-error"
+
+
 class TestMicroRequest(MicroTestSetup):
     async def test_nats_request(self) -> None:
         handler = self.make_handler(
@@ -170,6 +303,7 @@ class TestMicroRequest(MicroTestSetup):
             self.service_name(),
             self.service_version(),
             id_generator=self.service_id,
+            now=self.now,
         ) as service:
             await service.add_endpoint("the-subject", handler)
             result = await self.nats_client.request(
@@ -178,29 +312,13 @@ class TestMicroRequest(MicroTestSetup):
             assert result.data == b"the-response"
             assert result.headers == {"the": "response-header"}
 
-    async def test_nats_request_with_error(self) -> None:
-        async with micro.add_service(
-            self.nats_client,
-            self.service_name(),
-            self.service_version(),
-            id_generator=self.service_id,
-        ) as service:
-            await service.add_endpoint("the-subject", self.handler_with_error)
-            with pytest.raises(micro_client.ServiceError) as exc_info:
-                reply = await self.micro_client.request(
-                    "the-subject", b"the-payload", headers={"the": "header"}
-                )
-                # Should never happen but helps debuggging
-                assert not reply
-            assert exc_info.value.code == 500
-            assert exc_info.value.description == "Internal Server Error"
-
     async def test_nats_ignore_no_reply(self) -> None:
         async with micro.add_service(
             self.nats_client,
             self.service_name(),
             self.service_version(),
             id_generator=self.service_id,
+            now=self.now,
         ) as service:
             await service.add_endpoint("the-subject", self.handler)
             await self.nats_client.publish(
@@ -208,12 +326,10 @@ class TestMicroRequest(MicroTestSetup):
                 b"the-payload",
                 headers={"the": "header"},
             )
+            # Wait for the handler to process the message
+            await service._flush_pending()
             # Make sure request was processed and no error occured using stats
-            result = (
-                await self.micro_client.service(self.service_name())
-                .instance(self.service_id())
-                .stats()
-            )
+            result = service.stats()
             assert len(result.endpoints) == 1
             assert result.endpoints[0].num_requests == 1
             assert result.endpoints[0].num_errors == 0
@@ -221,143 +337,42 @@ class TestMicroRequest(MicroTestSetup):
             assert result.endpoints[0].average_processing_time > 0
 
 
-class TestMicro(MicroTestSetup):
-    async def test_ping(self) -> None:
-        expected = micro.models.PingInfo(
-            id=self.service_id(),
-            name=self.service_name(),
-            version=self.service_version(),
-            metadata={},
-            type="io.nats.micro.v1.ping_response",
+@pytest.mark.usefixtures("service")
+class TestMicroDiscovery(MicroTestSetup):
+    @pytest.mark.parametrize(
+        "verb,expected",
+        [
+            ("ping", EXPECTED_PING),
+            ("info", EXPECTED_INFO),
+            ("stats", EXPECTED_STATS),
+        ],
+        ids=["ping", "info", "stats"],
+    )
+    async def test_discovery(self, verb: str, expected: object) -> None:
+        service_client = self.micro_client.service(self.service_name())
+        # Send all discovery requests at once and wait for them together
+        results = await asyncio.gather(
+            getattr(self.micro_client, verb)(max_count=1),
+            getattr(self.micro_client, verb)(service=self.service_name(), max_count=1),
+            getattr(service_client, verb)(max_count=1),
+            getattr(service_client.instance(self.service_id()), verb)(),
+            getattr(self.instance_client, verb)(),
         )
-        async with micro.add_service(
-            self.nats_client,
-            self.service_name(),
-            self.service_version(),
-            id_generator=self.service_id,
-        ):
-            results = await self.micro_client.ping(max_count=1)
-            assert results == [expected]
-            results = await self.micro_client.ping(
-                service=self.service_name(), max_count=1
-            )
-            assert results == [expected]
-            results = await self.micro_client.service(self.service_name()).ping(
-                max_count=1
-            )
-            assert results == [expected]
-            result = (
-                await self.micro_client.service(self.service_name())
-                .instance(self.service_id())
-                .ping()
-            )
-            assert result == expected
-            result = await self.micro_client.instance(
-                self.service_name(), self.service_id()
-            ).ping()
-            assert result == expected
-
-    async def test_info(self) -> None:
-        expected = micro.ServiceInfo(
-            id=self.service_id(),
-            name=self.service_name(),
-            version=self.service_version(),
-            description="",
-            endpoints=[],
-            metadata={},
-            type="io.nats.micro.v1.info_response",
-        )
-        async with micro.add_service(
-            self.nats_client,
-            self.service_name(),
-            self.service_version(),
-            id_generator=self.service_id,
-        ):
-            results = await self.micro_client.info(max_count=1)
-            assert results == [expected]
-            # Save instance id
-            results = await self.micro_client.info(
-                service=self.service_name(), max_count=1
-            )
-            assert results == [expected]
-            results = await self.micro_client.service(self.service_name()).info(
-                max_count=1
-            )
-            assert results == [expected]
-            result = (
-                await self.micro_client.service(self.service_name())
-                .instance(self.service_id())
-                .info()
-            )
-            assert result == expected
-            result = await self.micro_client.instance(
-                self.service_name(), self.service_id()
-            ).info()
-            assert result == expected
-
-    async def test_stats(self) -> None:
-        expected = micro.ServiceStats(
-            name=self.service_name(),
-            version=self.service_version(),
-            id=self.service_id(),
-            endpoints=[],
-            metadata={},
-            type="io.nats.micro.v1.stats_response",
-            started=UNIX_START_TIME,
-        )
-        async with micro.add_service(
-            self.nats_client,
-            self.service_name(),
-            self.service_version(),
-            id_generator=self.service_id,
-            now=self.now,
-        ):
-            results = await self.micro_client.stats(max_count=1)
-            assert results == [expected]
-            # Save instance id
-            results = await self.micro_client.stats(
-                service=self.service_name(), max_count=1
-            )
-            assert results == [expected]
-            results = await self.micro_client.service(self.service_name()).stats(
-                max_count=1
-            )
-            assert results == [expected]
-            result = (
-                await self.micro_client.service(self.service_name())
-                .instance(self.service_id())
-                .stats()
-            )
-            assert result == expected
-            result = await self.micro_client.instance(
-                self.service_name(), self.service_id()
-            ).stats()
-            assert result == expected
+        assert results == [[expected], [expected], [expected], expected, expected]
+
+    async def test_info_getter(self, service: micro.Service) -> None:
+        result = await self.instance_client.info()
+        assert result == EXPECTED_INFO
+        assert result == service.info()
+
+    async def test_stats_getter(self, service: micro.Service) -> None:
+        result = await self.instance_client.stats()
+        assert result == EXPECTED_STATS
+        assert result == service.stats()
 
-    async def test_info_getter(self) -> None:
-        async with micro.add_service(
-            self.nats_client,
-            self.service_name(),
-            self.service_version(),
-            id_generator=self.service_id,
-        ) as service:
-            result = (
-                await self.micro_client.service(self.service_name())
-                .instance(self.service_id())
-                .info()
-            )
-            assert result == micro.ServiceInfo(
-                id=self.service_id(),
-                name=self.service_name(),
-                version=self.service_version(),
-                description="",
-                endpoints=[],
-                metadata={},
-                type="io.nats.micro.v1.info_response",
-            )
-            assert result == service.info()
 
-    async def test_stats_getter(self) -> None:
+class TestMicro(MicroTestSetup):
+    async def test_reset_after_request(self) -> None:
         async with micro.add_service(
             self.nats_client,
             self.service_name(),
@@ -365,53 +380,40 @@ class TestMicro(MicroTestSetup):
             id_generator=self.service_id,
             now=self.now,
         ) as service:
-            result = (
-                await self.micro_client.service(self.service_name())
-                .instance(self.service_id())
-                .stats()
-            )
-            assert result == micro.ServiceStats(
-                name=self.service_name(),
-                version=self.service_version(),
-                id=self.service_id(),
-                endpoints=[],
-                metadata={},
-                type="io.nats.micro.v1.stats_response",
-                started=UNIX_START_TIME,
+            await service.add_endpoint(
+                "endpoint1",
+                lambda request: request.respond(b"OK"),
             )
-            assert result == service.stats()
+            await self.micro_client.request("endpoint1", b"")
+            assert service.stats().endpoints[0].num_requests == 1
+            service._clock = lambda: UNIX_SECOND_DAY
+            service.reset()
+            result = service.stats()
+            assert result.endpoints[0].num_requests == 0
+            assert result.started == UNIX_SECOND_DAY
 
-    async def test_reset_after_request(self) -> None:
+    async def test_stats_request_after_reset(self) -> None:
         async with micro.add_service(
             self.nats_client,
             self.service_name(),
             self.service_version(),
             id_generator=self.service_id,
+            now=self.now,
         ) as service:
             await service.add_endpoint(
                 "endpoint1",
                 lambda request: request.respond(b"OK"),
             )
             await self.micro_client.request("endpoint1", b"")
-            result = (
-                await self.micro_client.service(self.service_name())
-                .instance(self.service_id())
-                .stats()
-            )
+            result = await self.instance_client.stats()
             assert result.endpoints[0].num_requests == 1
-            service._clock = lambda: datetime.datetime(
-                1970, 1, 2, tzinfo=datetime.timezone.utc
-            )
+            assert result.started == UNIX_START_TIME
+            service._clock = lambda: UNIX_SECOND_DAY
             service.reset()
-            result = (
-                await self.micro_client.service(self.service_name())
-                .instance(self.service_id())
-                .stats()
-            )
+            result = await self.instance_client.stats()
             assert result.endpoints[0].num_requests == 0
-            assert result.started == datetime.datetime(
-                1970, 1, 2, tzinfo=datetime.timezone.utc
-            )
+            assert result.started == UNIX_SECOND_DAY
+            assert result == service.stats()
 
     async def test_stopped_after_request(self) -> None:
         async with micro.add_service(
@@ -419,29 +421,39 @@ class TestMicro(MicroTestSetup):
             self.service_name(),
             self.service_version(),
             id_generator=self.service_id,
+            now=self.now,
         ) as service:
             await service.add_endpoint(
                 "endpoint1",
                 lambda request: request.respond(b"OK"),
             )
             await self.micro_client.request("endpoint1", b"")
-            result = (
-                await self.micro_client.service(self.service_name())
-                .instance(self.service_id())
-                .stats()
-            )
+            result = await self.instance_client.stats()
             assert result.endpoints[0].num_requests == 1
-            service._clock = lambda: datetime.datetime(1970, 1, 2)
+            service._clock = lambda: UNIX_SECOND_DAY
             await service.stop()
             results = await self.micro_client.stats(max_count=1, max_wait=0.1)
             assert results == []
 
+    async def test_info_after_add_endpoint(self) -> None:
+        async with micro.add_service(
+            self.nats_client,
+            self.service_name(),
+            self.service_version(),
+            id_generator=self.service_id,
+            now=self.now,
+        ) as service:
+            assert await self.instance_client.info() == EXPECTED_INFO
+            await service.add_endpoint("endpoint1", self.handler)
+            assert await self.instance_client.info() == self.expect_info()
+
     async def test_start_then_stopped(self) -> None:
         async with micro.add_service(
             self.nats_client,
             self.service_name(),
             self.service_version(),
             id_generator=self.service_id,
+            now=self.now,
         ) as service:
             assert not service.stopped()
             await service.stop()
@@ -451,85 +463,36 @@ class TestMicro(MicroTestSetup):
             assert str(exc.value) == "Cannot add endpoint to a stopped service"
 
 
+@pytest.mark.usefixtures("service")
 class TestMicroClientIterators(MicroTestSetup):
-    async def test_ping(self) -> None:
-        expected = micro.models.PingInfo(
-            id=self.service_id(),
-            name=self.service_name(),
-            version=self.service_version(),
-            metadata={},
-            type="io.nats.micro.v1.ping_response",
-        )
-        async with micro.add_service(
-            self.nats_client,
-            self.service_name(),
-            self.service_version(),
-            id_generator=self.service_id,
-        ):
-            async with self.micro_client.ping_iter(max_count=1) as replies:
-                pongs = [pong async for pong in replies]
-            assert pongs == [expected]
-            async with self.micro_client.service(self.service_name()).ping_iter(
-                max_count=1
-            ) as replies:
-                pongs = [pong async for pong in replies]
-            assert pongs == [expected]
-
-    async def test_info(self) -> None:
-        expected = micro.ServiceInfo(
-            id=self.service_id(),
-            name=self.service_name(),
-            version=self.service_version(),
-            description="",
-            endpoints=[],
-            metadata={},
-            type="io.nats.micro.v1.info_response",
-        )
-        async with micro.add_service(
-            self.nats_client,
-            self.service_name(),
-            self.service_version(),
-            id_generator=self.service_id,
-        ):
-            async with self.micro_client.info_iter(max_count=1) as replies:
-                infos = [info async for info in replies]
-            assert infos == [expected]
-            async with self.micro_client.service(self.service_name()).info_iter(
-                max_count=1
-            ) as replies:
-                infos = [info async for info in replies]
-            assert infos == [expected]
-
-    async def test_stats(self) -> None:
-        expected = micro.ServiceStats(
-            name=self.service_name(),
-            version=self.service_version(),
-            id=self.service_id(),
-            endpoints=[],
-            metadata={},
-            type="io.nats.micro.v1.stats_response",
-            started=UNIX_START_TIME,
+    async def collect(
+        self, *iterators: AsyncContextManager[AsyncIterator[T]]
+    ) -> list[list[T]]:
+        # Enter all iterators first so that requests are sent concurrently
+        async with contextlib.AsyncExitStack() as stack:
+            replies = [await stack.enter_async_context(it) for it in iterators]
+            return [[reply async for reply in r] for r in replies]
+
+    @pytest.mark.parametrize(
+        "verb,expected",
+        [
+            ("ping_iter", EXPECTED_PING),
+            ("info_iter", EXPECTED_INFO),
+            ("stats_iter", EXPECTED_STATS),
+        ],
+        ids=["ping", "info", "stats"],
+    )
+    async def test_discovery(self, verb: str, expected: object) -> None:
+        results = await self.collect(
+            getattr(self.micro_client, verb)(max_count=1),
+            getattr(self.micro_client.service(self.service_name()), verb)(max_count=1),
         )
-        async with micro.add_service(
-            self.nats_client,
-            self.service_name(),
-            self.service_version(),
-            id_generator=self.service_id,
-            now=self.now,
-        ):
-            async with self.micro_client.stats_iter(max_count=1) as replies:
-                stats = [stat async for stat in replies]
-            assert stats == [expected]
-            async with self.micro_client.service(self.service_name()).stats_iter(
-                max_count=1
-            ) as replies:
-                stats = [stat async for stat in replies]
-            assert stats == [expected]
+        assert results == [[expected], [expected]]
 
 
 class TestMicroEndpoint(MicroTestSetup):
 
-    async def test_info(self) -> None:
+    async def test_handler(self) -> None:
         async with micro.add_service(
             self.nats_client,
             self.service_name(),
@@ -541,29 +504,10 @@ class TestMicroEndpoint(MicroTestSetup):
                 "endpoint1",
                 self.handler,
             )
-            result = (
-                await self.micro_client.service(self.service_name())
-                .instance(self.service_id())
-                .info()
-            )
-            assert result == micro.ServiceInfo(
-                id=self.service_id(),
-                name=self.service_name(),
-                version=self.service_version(),
-                description="",
-                endpoints=[
-                    micro.EndpointInfo(
-                        name="endpoint1",
-                        subject="endpoint1",
-                        queue_group="q",
-                        metadata={},
-                    )
-                ],
-                metadata={},
-                type="io.nats.micro.v1.info_response",
-            )
+            result = await self.nats_client.request("endpoint1", b"")
+            assert result.data == b"OK"
 
-    async def test_stats(self) -> None:
+    async def test_handler_stats(self) -> None:
         async with micro.add_service(
             self.nats_client,
             self.service_name(),
@@ -575,34 +519,14 @@ class TestMicroEndpoint(MicroTestSetup):
                 "endpoint1",
                 self.handler,
             )
-            result = (
-                await self.micro_client.service(self.service_name())
-                .instance(self.service_id())
-                .stats()
-            )
-            assert result == micro.ServiceStats(
-                name=self.service_name(),
-                version=self.service_version(),
-                id=self.service_id(),
-                endpoints=[
-                    micro.EndpointStats(
-                        name="endpoint1",
-                        subject="endpoint1",
-                        queue_group="q",
-                        num_errors=0,
-                        num_requests=0,
-                        last_error="",
-                        processing_time=0,
-                        average_processing_time=0,
-                        data={},
-                    )
-                ],
-                metadata={},
-                type="io.nats.micro.v1.stats_response",
-                started=UNIX_START_TIME,
-            )
+            await self.nats_client.request("endpoint1", b"")
+            result = service.stats()
+            assert result.endpoints[0].num_requests == 1
+            assert result.endpoints[0].num_errors == 0
+            assert result.endpoints[0].processing_time > 0
+            assert result.endpoints[0].average_processing_time > 0
 
-    async def test_handler(self) -> None:
+    async def test_handler_stats_after_stats_request(self) -> None:
         async with micro.add_service(
             self.nats_client,
             self.service_name(),
@@ -614,10 +538,14 @@ class TestMicroEndpoint(MicroTestSetup):
                 "endpoint1",
                 self.handler,
             )
-            result = await self.nats_client.request("endpoint1", b"")
-            assert result.data == b"OK"
+            result = await self.instance_client.stats()
+            assert result.endpoints[0].num_requests == 0
+            await self.nats_client.request("endpoint1", b"")
+            result = await self.instance_client.stats()
+            assert result.endpoints[0].num_requests == 1
+            assert result == service.stats()
 
-    async def test_handler_stats(self) -> None:
+    async def test_endpoint_stats_data_after_stats_request(self) -> None:
         async with micro.add_service(
             self.nats_client,
             self.service_name(),
@@ -625,20 +553,17 @@ class TestMicroEndpoint(MicroTestSetup):
             now=self.now,
             id_generator=self.service_id,
         ) as service:
-            await service.add_endpoint(
+            endpoint = await service.add_endpoint(
                 "endpoint1",
                 self.handler,
             )
-            await self.nats_client.request("endpoint1", b"")
-            result = (
-                await self.micro_client.service(self.service_name())
-                .instance(self.service_id())
-                .stats()
-            )
-            assert result.endpoints[0].num_requests == 1
-            assert result.endpoints[0].num_errors == 0
-            assert result.endpoints[0].processing_time > 0
-            assert result.endpoints[0].average_processing_time > 0
+            result = await self.instance_client.stats()
+            assert result.endpoints[0].data == {}
+            assert endpoint.stats.data is not None
+            endpoint.stats.data["custom"] = 42
+            result = await self.instance_client.stats()
+            assert result.endpoints[0].data == {"custom": 42}
+            assert result == service.stats()
 
     async def test_handler_with_error(self) -> None:
         async with micro.add_service(
@@ -671,11 +596,7 @@ class TestMicroEndpoint(MicroTestSetup):
             )
             with pytest.raises(micro_client.ServiceError):
                 await self.micro_client.request("endpoint1", b"")
-            result = (
-                await self.micro_client.service(self.service_name())
-                .instance(self.service_id())
-                .stats()
-            )
+            result = service.stats()
             assert result.endpoints[0].num_requests == 1
             assert result.endpoints[0].num_errors == 1
             assert result.endpoints[0].last_error == "ValueError('error')"
@@ -683,44 +604,27 @@ class TestMicroEndpoint(MicroTestSetup):
             assert result.endpoints[0].average_processing_time > 0
 
 
-class TestMicroEndpointWithSubject(MicroTestSetup):
-
-    async def test_info(self) -> None:
-        async with micro.add_service(
-            self.nats_client,
-            self.service_name(),
-            self.service_version(),
-            now=self.now,
-            id_generator=self.service_id,
-        ) as service:
-            await service.add_endpoint(
-                "endpoint1",
-                self.handler,
-                subject="other",
-            )
-            result = (
-                await self.micro_client.service(self.service_name())
-                .instance(self.service_id())
-                .info()
-            )
-            assert result == micro.ServiceInfo(
-                id=self.service_id(),
-                name=self.service_name(),
-                version=self.service_version(),
-                description="",
-                endpoints=[
-                    micro.EndpointInfo(
-                        name="endpoint1",
-                        subject="other",
-                        queue_group="q",
-                        metadata={},
-                    )
-                ],
-                metadata={},
-                type="io.nats.micro.v1.info_response",
-            )
-
-    async def test_stats(self) -> None:
+@pytest.mark.parametrize(
+    "groups,subject,expected_subject,expected_queue_group",
+    [
+        ([], None, "endpoint1", "q"),
+        ([], "other", "other", "q"),
+        ([("group1", "q1")], None, "group1.endpoint1", "q1"),
+        (
+            [("group1", "q1"), ("group2", "q2")],
+            None,
+            "group1.group2.endpoint1",
+            "q2",
+        ),
+    ],
+    ids=["endpoint", "endpoint-with-subject", "group", "subgroup"],
+)
+@pytest.mark.usefixtures("service")
+class TestMicroEndpointRegistration(MicroTestSetup):
+    @pytest_asyncio.fixture
+    async def service(
+        self, groups: list[tuple[str, str]], subject: str | None
+    ) -> AsyncIterator[micro.Service]:
         async with micro.add_service(
             self.nats_client,
             self.service_name(),
@@ -728,195 +632,119 @@ class TestMicroEndpointWithSubject(MicroTestSetup):
             now=self.now,
             id_generator=self.service_id,
         ) as service:
-            await service.add_endpoint(
-                "endpoint1",
-                self.handler,
-                subject="other",
-            )
-            result = (
-                await self.micro_client.service(self.service_name())
-                .instance(self.service_id())
-                .stats()
-            )
-            assert result == micro.ServiceStats(
-                name=self.service_name(),
-                version=self.service_version(),
-                id=self.service_id(),
-                endpoints=[
-                    micro.EndpointStats(
-                        name="endpoint1",
-                        subject="other",
-                        queue_group="q",
-                        num_errors=0,
-                        num_requests=0,
-                        last_error="",
-                        processing_time=0,
-                        average_processing_time=0,
-                        data={},
-                    )
-                ],
-                metadata={},
-                type="io.nats.micro.v1.stats_response",
-                started=UNIX_START_TIME,
-            )
-
-
-class TestMicroGroup(MicroTestSetup):
-
-    async def test_info(self) -> None:
-        async with micro.add_service(
-            self.nats_client,
-            self.service_name(),
-            self.service_version(),
-            now=self.now,
-            id_generator=self.service_id,
-        ) as service:
-            group = service.add_group("group1", queue_group="q1")
-            await group.add_endpoint(
-                "endpoint1",
-                self.handler,
-            )
-            result = (
-                await self.micro_client.service(self.service_name())
-                .instance(self.service_id())
-                .info()
-            )
-            assert result == micro.ServiceInfo(
-                id=self.service_id(),
-                name=self.service_name(),
-                version=self.service_version(),
-                description="",
-                endpoints=[
-                    micro.EndpointInfo(
-                        name="endpoint1",
-                        subject="group1.endpoint1",
-                        queue_group="q1",
-                        metadata={},
-                    )
-                ],
-                metadata={},
-                type="io.nats.micro.v1.info_response",
-            )
-
-    async def test_stats(self) -> None:
-        async with micro.add_service(
-            self.nats_client,
-            self.service_name(),
-            self.service_version(),
-            now=self.now,
-            id_generator=self.service_id,
-        ) as service:
-            group = service.add_group("group1", queue_group="q1")
-            await group.add_endpoint(
-                "endpoint1",
-                self.handler,
-            )
-            result = (
-                await self.micro_client.service(self.service_name())
-                .instance(self.service_id())
-                .stats()
-            )
-            assert result == micro.ServiceStats(
-                name=self.service_name(),
-                version=self.service_version(),
-                id=self.service_id(),
-                endpoints=[
-                    micro.EndpointStats(
-                        name="endpoint1",
-                        subject="group1.endpoint1",
-                        queue_group="q1",
-                        num_errors=0,
-                        num_requests=0,
-                        last_error="",
-                        processing_time=0,
-                        average_processing_time=0,
-                        data={},
-                    )
-                ],
-                metadata={},
-                type="io.nats.micro.v1.stats_response",
-                started=UNIX_START_TIME,
-            )
-
+            parent: micro.Service | micro.Group = service
+            for name, queue_group in groups:
+                parent = parent.add_group(name, queue_group=queue_group)
+            await parent.add_endpoint("endpoint1", self.handler, subject=subject)
+            yield service
+
+    async def test_info(self, expected_subject: str, expected_queue_group: str) -> None:
+        result = await self.instance_client.info()
+        assert result == self.expect_info(
+            subject=expected_subject, queue_group=expected_queue_group
+        )
 
-class TestMicroGroupWithSubgroup(MicroTestSetup):
+    async def test_stats(
+        self, expected_subject: str, expected_queue_group: str
+    ) -> None:
+        result = await self.instance_client.stats()
+        assert result == self.expect_stats(
+            subject=expected_subject, queue_group=expected_queue_group
+        )
 
-    async def test_info(self) -> None:
-        async with micro.add_service(
-            self.nats_client,
-            self.service_name(),
-            self.service_version(),
-            now=self.now,
-            id_generator=self.service_id,
-        ) as service:
-            group = service.add_group("group1", queue_group="q1")
-            subgroup = group.add_group("group2", queue_group="q2")
-            await subgroup.add_endpoint(
-                "endpoint1",
-                self.handler,
-            )
-            result = (
-                await self.micro_client.service(self.service_name())
-                .instance(self.service_id())
-                .info()
-            )
-            assert result == micro.ServiceInfo(
-                id=self.service_id(),
-                name=self.service_name(),
-                version=self.service_version(),
-                description="",
-                endpoints=[
-                    micro.EndpointInfo(
-                        name="endpoint1",
-                        subject="group1.group2.endpoint1",
-                        queue_group="q2",
-                        metadata={},
-                    )
-                ],
-                metadata={},
-                type="io.nats.micro.v1.info_response",
-            )
 
-    async def test_stats(self) -> None:
-        async with micro.add_service(
-            self.nats_client,
-            self.service_name(),
-            self.service_version(),
-            now=self.now,
-            id_generator=self.service_id,
-        ) as service:
-            group = service.add_group("group1", queue_group="q1")
-            subgroup = group.add_group("group2", queue_group="q2")
-            await subgroup.add_endpoint(
-                "endpoint1",
-                self.handler,
-            )
-            result = (
-                await self.micro_client.service(self.service_name())
-                .instance(self.service_id())
-                .stats()
-            )
-            assert result == micro.ServiceStats(
-                name=self.service_name(),
-                version=self.service_version(),
-                id=self.service_id(),
-                endpoints=[
-                    micro.EndpointStats(
-                        name="endpoint1",
-                        subject="group1.group2.endpoint1",
-                        queue_group="q2",
-                        num_errors=0,
-                        num_requests=0,
-                        last_error="",
-                        processing_time=0,
-                        average_processing_time=0,
-                        data={},
-                    )
-                ],
-                metadata={},
-                type="io.nats.micro.v1.stats_response",
-                started=UNIX_START_TIME,
-            )
+Model = Union[
+    micro.models.PingInfo,
+    micro.EndpointInfo,
+    micro.ServiceInfo,
+    micro.EndpointStats,
+    micro.ServiceStats,
+]
+
+ENDPOINT_INFO_SAMPLE = micro.EndpointInfo(
+    name="endpoint1",
+    subject="group1.endpoint1",
+    metadata={"the": "endpoint-metadata"},
+    queue_group="q1",
+)
+
+ENDPOINT_STATS_SAMPLE = micro.EndpointStats(
+    name="endpoint1",
+    subject="group1.endpoint1",
+    num_requests=3,
+    num_errors=1,
+    last_error="ValueError('error')",
+    processing_time=30,
+    average_processing_time=10,
+    queue_group="q1",
+    data={"the": "data"},
+)
+
+MODEL_SAMPLES: list[Model] = [
+    micro.models.PingInfo(
+        id="123",
+        name="service1",
+        version="0.0.1",
+        metadata={"the": "metadata"},
+        type="io.nats.micro.v1.ping_response",
+    ),
+    ENDPOINT_INFO_SAMPLE,
+    micro.ServiceInfo(
+        id="123",
+        name="service1",
+        version="0.0.1",
+        description="the description",
+        metadata={"the": "metadata"},
+        endpoints=[ENDPOINT_INFO_SAMPLE],
+        type="io.nats.micro.v1.info_response",
+    ),
+    ENDPOINT_STATS_SAMPLE,
+    micro.ServiceStats(
+        name="service1",
+        id="123",
+        version="0.0.1",
+        started=UNIX_START_TIME,
+        endpoints=[ENDPOINT_STATS_SAMPLE],
+        metadata={"the": "metadata"},
+        type="io.nats.micro.v1.stats_response",
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    "model", MODEL_SAMPLES, ids=[type(model).__name__ for model in MODEL_SAMPLES]
+)
+class TestMicroModelFields:
+    """Models implement these methods field by field, check none is left out."""
+
+    def field_names(self, model: Model) -> list[str]:
+        return [field.name for field in dataclasses.fields(model)]
+
+    def test_sample_sets_every_field(self, model: Model) -> None:
+        for name in self.field_names(model):
+            assert getattr(model, name) is not None, name
+
+    def test_eq_compares_every_field(self, model: Model) -> None:
+        for name in self.field_names(model):
+            other = model.copy()
+            assert other == model
+            setattr(other, name, object())
+            assert other != model, name
+
+    def test_copy_copies_every_field(self, model: Model) -> None:
+        copied = model.copy()
+        for name in self.field_names(model):
+            assert getattr(copied, name) == getattr(model, name), name
+
+    def test_as_dict_includes_every_field(self, model: Model) -> None:
+        result = model.as_dict()
+        assert sorted(result) == sorted(self.field_names(model))
+
+    def test_from_response_reads_every_field(self, model: Model) -> None:
+        response = json.loads(internal.encode_json(model.as_dict()))
+        parsed = type(model).from_response(response)
+        for name in self.field_names(model):
+            assert getattr(parsed, name) == getattr(model, name), name
 
 
 class TestMicroModels:
@@ -982,3 +810,74 @@ class TestMicroModels:
             )
         )
         assert stats2.endpoints != stats.endpoints
+
+    def test_copy_service_stats_with_endpoints_and_mutate(self) -> None:
+        stats = micro.ServiceStats(
+            name="service1",
+            version="0.0.1",
+            id="123",
+            endpoints=[
+                micro.EndpointStats(
+                    name="endpoint1",
+                    subject="endpoint1",
+                    num_requests=1,
+                    num_errors=0,
+                    last_error="",
+                    processing_time=10,
+                    average_processing_time=10,
+                    queue_group="q",
+                    data={"the": "data"},
+                )
+            ],
+            metadata={"the": "metadata"},
+            type="io.nats.micro.v1.stats_response",
+            started=UNIX_START_TIME,
+        )
+        stats2 = stats.copy()
+        assert stats2 == stats
+        stats2.endpoints[0].num_requests = 2
+        assert stats2.endpoints[0] != stats.endpoints[0]
+        assert stats2.endpoints[0].data is not None
+        stats2.endpoints[0].data["the"] = "other"
+        assert stats2.endpoints[0].data != stats.endpoints[0].data
+
+
+class TestJsonCodec:
+    @pytest.fixture(autouse=True, params=["orjson", "json"])
+    def backend(
+        self, request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        if request.param == "json":
+            monkeypatch.setattr(internal, "orjson", None)
+        elif internal.orjson is None:
+            pytest.skip("orjson is not installed")
+
+    def test_encode_json(self) -> None:
+        assert internal.encode_json({"a": 1, "b": [1, 2]}) == b'{"a":1,"b":[1,2]}'
+
+    def test_encode_json_with_large_integer(self) -> None:
+        assert internal.encode_json({"a": 2**70 + 1}) == b'{"a":1180591620717411303425}'
+
+    def test_encode_stats_with_large_integer_data(self) -> None:
+        stats = micro.ServiceStats(
+            name="service1",
+            version="0.0.1",
+            id="123",
+            endpoints=[
+                micro.EndpointStats(
+                    name="endpoint1",
+                    subject="endpoint1",
+                    num_requests=0,
+                    num_errors=0,
+                    last_error="",
+                    processing_time=0,
+                    average_processing_time=0,
+                    data={"big": 2**70 + 1},
+                )
+            ],
+            started=UNIX_START_TIME,
+        )
+        result = json.loads(internal.encode_stats(stats))
+        value = result["endpoints"][0]["data"]["big"]
+        assert type(value) is int
+        assert value == 2**70 + 1